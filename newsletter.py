@@ -12,25 +12,38 @@ Newsletter diária (07:00 America/Sao_Paulo)
 - Deduplicação global por URL canônica + similaridade de título
 - requests -> fallback Selenium (headless) quando necessário
 - SMTP com debug, SSL→STARTTLS, 3 tentativas e variáveis para host/port
+- Cache opcional em disco (NEWS_CACHE_DIR) para reexecuções no mesmo dia
 """
 
 import os
 import sys
 import re
+import json
+import functools
+import time
+import hashlib
 import smtplib
+import threading
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from html import escape
+from itertools import chain, islice
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv  # para rodar localmente
 from zoneinfo import ZoneInfo
 
 # ====== Selenium (fallback) ======
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -95,6 +108,25 @@ USER_AGENT = {
 WANT_PER_SECTION = 4     # alvo por editoria
 SCAN_LIMIT = 60          # quantos links brutos vasculhar por seção
 TITLE_SIM_THRESHOLD = 0.85
+ARTICLE_WORKERS = 8      # downloads de artigos em paralelo
+LISTING_WORKERS = 6      # páginas de editoria em paralelo
+
+# Selenium: apenas esperas explícitas (WebDriverWait). Implicit wait > 0 faria
+# cada lookup que falha bloquear e se somaria às esperas explícitas.
+IMPLICIT_WAIT = 0
+PAGE_LOAD_TIMEOUT = 15
+SCRIPT_TIMEOUT = 10
+SELENIUM_WAIT = 15
+BLOCKED_URL_PATTERNS = [
+    # imagens e fontes
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # estilo e mídia (só lemos âncoras)
+    "*.css", "*.mp4", "*.webm", "*.m3u8",
+    # analytics/anúncios
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*",
+]
 
 # ----------------- Utilidades de horário (07:00 BRT) -----------------
 
@@ -109,10 +141,13 @@ def should_send_now():
 def get_driver():
     chrome_path = os.getenv("CHROME_BIN")
     chromedriver_path = os.getenv("CHROMEDRIVER_BIN", "/usr/bin/chromedriver")
+    profile_dir = os.getenv("CHROME_PROFILE_DIR")  # opcional: mantém cookies entre execuções
 
     opts = Options()
     if chrome_path:
         opts.binary_location = chrome_path
+    if profile_dir:
+        opts.add_argument(f"--user-data-dir={os.path.expanduser(profile_dir)}")
 
     opts.add_argument("--headless=new")
     opts.add_argument("--no-sandbox")
@@ -122,8 +157,15 @@ def get_driver():
     opts.add_argument("--disable-renderer-backgrounding")
     opts.add_argument("--disable-background-timer-throttling")
     opts.add_argument("--disable-backgrounding-occluded-windows")
-    opts.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees,AutomationControlled")
-    opts.add_argument("--remote-debugging-port=9222")
+    opts.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees,AutomationControlled,"
+                      "MediaRouter,OptimizationHints,AudioServiceOutOfProcess")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-background-networking")
+    opts.add_argument("--disable-component-update")
+    opts.add_argument("--disable-sync")
+    opts.add_argument("--no-first-run")
+    opts.add_argument("--mute-audio")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
     opts.page_load_strategy = "eager"
     prefs = {
         "profile.managed_default_content_settings.images": 2,
@@ -134,27 +176,73 @@ def get_driver():
 
     service = Service(chromedriver_path)
     driver = webdriver.Chrome(service=service, options=opts)
-    driver.set_page_load_timeout(90)
-    driver.implicitly_wait(0)
+    try:
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        driver.implicitly_wait(IMPLICIT_WAIT)
+        # só lemos texto/links: nada de imagem ou fonte na rede
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception:
+        driver.quit()  # Chrome já subiu: não deixa o processo órfão
+        raise
     return driver
 
+class LazyDriver:
+    """
+    Proxy do WebDriver que só sobe o Chrome no primeiro uso. Na maioria das
+    execuções o requests resolve todas as editorias e o navegador nem abre.
+    """
+    def __init__(self):
+        self._driver = None
+        self._error = None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            # se o Chrome já falhou ao subir, não tenta de novo nesta execução
+            if self._error is not None:
+                raise RuntimeError(f"Chrome indisponível: {self._error!r}")
+            try:
+                self._driver = get_driver()
+            except Exception as e:
+                self._error = e
+                raise
+        return getattr(self._driver, name)
+
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
 # ----------------- Normalização / deduplicação -----------------
 
 STOPWORDS = {"de","da","do","das","dos","para","por","em","no","na","nos","nas",
              "e","a","o","as","os","um","uma","ao","à","com","sobre","contra","entre",
              "se","que","porém","mas","ou"}
 
+# uma única passada em C no lugar de uma cadeia de .replace()
+_ACCENT_TABLE = str.maketrans("áàâãéêíóôõúç", "aaaaeeiooouc")
+
 def normalize_kw(s: str) -> str:
-    s = s.lower()
-    return (s.replace("á", "a").replace("à", "a").replace("â", "a")
-             .replace("é", "e").replace("ê", "e")
-             .replace("í", "i")
-             .replace("ó", "o").replace("ô", "o")
-             .replace("ú", "u").replace("ç", "c"))
+    return s.lower().translate(_ACCENT_TABLE)
+
+# todas as palavras-chave numa única alternância: uma varredura por título
+HEALTH_RE = re.compile("|".join(sorted({re.escape(normalize_kw(k)) for k in HEALTH_KEYWORDS})))
+
+def is_health_title(title: str) -> bool:
+    return HEALTH_RE.search(normalize_kw(title)) is not None
+
+# esquema://[www.]host/path — cobre praticamente todo link absoluto coletado
+_ABS_URL_RE = re.compile(r"^[a-z][a-z0-9+.-]*://(?:www\.)?([^/?#]+)([^?#]*)", re.I)
 
 def normalize_url(u: str) -> str:
+    u = u.strip()
+    m = _ABS_URL_RE.match(u)
+    if m:
+        return "//" + m.group(1).lower() + m.group(2).rstrip("/")
+    # caminho lento para o que não for URL absoluta
     try:
-        s = urlsplit(u.strip())
+        s = urlsplit(u)
         host = (s.netloc or "").lower()
         if host.startswith("www."):
             host = host[4:]
@@ -163,14 +251,14 @@ def normalize_url(u: str) -> str:
     except Exception:
         return u
 
-def tokenize_title(t: str):
-    t = normalize_kw(t)
-    t = re.sub(r"[^a-z0-9\s]", " ", t)
-    tokens = [tok for tok in t.split() if tok and tok not in STOPWORDS]
-    return set(tokens)
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]+")
+
+@functools.lru_cache(maxsize=1024)
+def tokenize_title(t: str) -> frozenset:
+    t = _NON_ALNUM_RE.sub(" ", normalize_kw(t))
+    return frozenset(tok for tok in t.split() if tok not in STOPWORDS)
 
-def title_similarity(t1: str, t2: str) -> float:
-    a, b = tokenize_title(t1), tokenize_title(t2)
+def jaccard(a: set, b: set) -> float:
     if not a or not b:
         return 0.0
     inter = len(a & b)
@@ -179,33 +267,58 @@ def title_similarity(t1: str, t2: str) -> float:
 
 class Deduper:
     def __init__(self, title_threshold: float = TITLE_SIM_THRESHOLD):
+        self.title_threshold = title_threshold
         self.seen_urls = set()
-        self.titles = []
+        self.token_sets = []  # tokens de cada título aceito, calculados uma vez
 
     def is_dup(self, title: str, url: str) -> bool:
         u_norm = normalize_url(url)
         if u_norm in self.seen_urls:
             return True
-        for t in self.titles:
-            if title_similarity(t, title) >= TITLE_SIM_THRESHOLD:
+        tokens = tokenize_title(title)
+        n = len(tokens)
+        for seen in self.token_sets:
+            # Jaccard ≤ menor/maior tamanho: descarta sem montar & e |
+            if min(n, len(seen)) < self.title_threshold * max(n, len(seen)):
+                continue
+            if jaccard(seen, tokens) >= self.title_threshold:
                 return True
         self.seen_urls.add(u_norm)
-        self.titles.append(title)
+        self.token_sets.append(tokens)
         return False
 
 # ----------------- Coleta (requests → fallback Selenium) -----------------
 
-def _filter_links(url_base, soup, scan_limit=SCAN_LIMIT):
+# Sessão única para todos os downloads; recebe também os cookies do Chrome
+# quando uma editoria precisa do fallback Selenium.
+SESSION = requests.Session()
+SESSION.headers.update(USER_AGENT)
+_adapter = HTTPAdapter(
+    pool_connections=16,   # hosts distintos mantidos no pool
+    pool_maxsize=ARTICLE_WORKERS + LISTING_WORKERS,  # conexões por host (uma por thread)
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+def share_driver_cookies(driver):
+    # consentimento/paywall leve liberado no Chrome passa a valer para os
+    # artigos baixados via requests (sem renderizar cada um no navegador)
+    for c in driver.get_cookies():
+        SESSION.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+
+BAD_LINK_RE = re.compile(r"/subscribe|/signin|/login|#")
+
+def _filter_links(url_base, anchors, scan_limit=SCAN_LIMIT):
+    """`anchors`: pares (texto, href) na ordem do documento."""
     seen, items = set(), []
-    for a in soup.select("a[href]"):
-        title = (a.get_text() or "").strip()
-        href = a.get("href")
-        if not href or not title:
-            continue
-        full = urljoin(url_base, href)
-        if len(title) < 20:
+    for title, href in anchors:
+        # quebras de linha/espaços repetidos do HTML viram um espaço só
+        title = " ".join((title or "").split())
+        if not href or len(title) < 20:
             continue
-        if any(x in full for x in ("/subscribe", "/signin", "/login", "#")):
+        full = href if href.startswith(("https://", "http://")) else urljoin(url_base, href)
+        if BAD_LINK_RE.search(full):
             continue
         if full not in seen:
             seen.add(full)
@@ -216,145 +329,360 @@ def _filter_links(url_base, soup, scan_limit=SCAN_LIMIT):
 
 def fetch_links_via_requests(url, scan_limit=SCAN_LIMIT):
     try:
-        r = requests.get(url, timeout=20, headers=USER_AGENT)
+        r = SESSION.get(url, timeout=20)
         if r.status_code != 200:
             return []
-        soup = BeautifulSoup(r.text, "lxml")
-        return _filter_links(url, soup, scan_limit=scan_limit)
+        tree = parse_html(r)
+        anchors = ((a.text_content(), a.get("href")) for a in XPATH_LINKS(tree))
+        return _filter_links(url, anchors, scan_limit=scan_limit)
     except Exception:
         return []
 
+JS_COLLECT_ANCHORS = (
+    "return Array.from(document.querySelectorAll('a[href]'),"
+    " a => [a.textContent, a.getAttribute('href')]);"
+)
+
 def fetch_links_via_selenium(driver, url, scan_limit=SCAN_LIMIT):
     try:
-        driver.get(url)
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "a")))
-        soup = BeautifulSoup(driver.page_source, "lxml")
-        return _filter_links(url, soup, scan_limit=scan_limit)
+        try:
+            driver.get(url)
+        except TimeoutException:
+            # recurso lento de terceiros: interrompe e usa o DOM que já chegou
+            driver.execute_script("window.stop();")
+        WebDriverWait(driver, SELENIUM_WAIT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "a[href]")))
+        # DOM com links já basta: corta scripts/trackers que ainda carregam
+        driver.execute_script("window.stop();")
+        share_driver_cookies(driver)
+        # um único round-trip ao browser, em vez de serializar o DOM inteiro
+        anchors = driver.execute_script(JS_COLLECT_ANCHORS)
+        return _filter_links(url, anchors or [], scan_limit=scan_limit)
     except Exception:
         return []
 
-def fetch_links_bulk(driver, url, scan_limit=SCAN_LIMIT):
-    links = fetch_links_via_requests(url, scan_limit=scan_limit)
-    if links:
-        return links
-    return fetch_links_via_selenium(driver, url, scan_limit=scan_limit)
-
-def belongs_to_section(url: str, must_parts: list[str]) -> bool:
-    path = urlsplit(url).path.lower()
-    return any(part in path for part in must_parts)
+def fetch_listings(driver, urls, scan_limit=SCAN_LIMIT):
+    """
+    Baixa todas as páginas de listagem em paralelo via requests.
+    As que vierem vazias caem no Selenium, em série (um único driver,
+    que não é thread-safe). Com NEWS_CACHE_DIR, listagens recentes
+    (LISTING_CACHE_TTL) são reaproveitadas sem ir à rede.
+    """
+    listings = {}
+    for url in urls:
+        cached = cache_get("listings", url, LISTING_CACHE_TTL)
+        if cached:
+            listings[url] = [tuple(x) for x in cached]
+    pending = [u for u in urls if u not in listings]
+    with ThreadPoolExecutor(max_workers=LISTING_WORKERS) as ex:
+        results = list(ex.map(lambda u: fetch_links_via_requests(u, scan_limit=scan_limit), pending))
+    for url, links in zip(pending, results):
+        links = links or fetch_links_via_selenium(driver, url, scan_limit=scan_limit)
+        if links:
+            cache_set("listings", url, links)
+        listings[url] = links
+    return listings
+
+# ----------------- Parsing HTML (lxml direto) -----------------
+
+# compilada uma vez; pré-filtro em C (libxml2): texto curto e âncoras de fragmento nem chegam ao Python
+XPATH_LINKS = etree.XPath(
+    "//a[@href][string-length(normalize-space(.)) >= 20][not(contains(@href, '#'))]"
+)
+
+def sniff_encoding(r, head: bytes):
+    """
+    Encoding para o parser lxml. Usa o charset do cabeçalho quando
+    declarado; senão o lxml detecta pelo <meta charset>; sem nenhum dos
+    dois assume UTF-8 (o libxml2 cairia em latin-1).
+    """
+    ctype = r.headers.get("Content-Type", "").lower()
+    if "charset=" in ctype:
+        return r.encoding
+    if b"charset" in head[:4096].lower():
+        return None
+    return "utf-8"
+
+def parse_html(r):
+    # árvore lxml direto dos bytes da resposta
+    # sem tabela de ids (não usamos); parser por chamada: não é thread-safe
+    parser = lxml.html.HTMLParser(encoding=sniff_encoding(r, r.content), collect_ids=False)
+    return lxml.html.fromstring(r.content, parser=parser)
+
+def node_text(el) -> str:
+    # equivalente ao get_text(" ", strip=True) do BeautifulSoup
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+def html_to_text(fragment) -> str:
+    # trecho HTML (ex.: <description> do RSS) → texto corrido
+    if not fragment or not fragment.strip():
+        return ""
+    return node_text(lxml.html.fragment_fromstring(fragment, create_parent="div"))
+
+RSS_PARSE_OPTS = {"resolve_entities": False, "no_network": True, "recover": True}
+RSS_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+# ----------------- Cache em disco (opcional) -----------------
+
+ARTICLE_CACHE_TTL = 24 * 3600
+LISTING_CACHE_TTL = 30 * 60     # capas e feeds mudam ao longo do dia
+MAX_ARTICLE_BYTES = 1_000_000   # o texto útil cabe folgado; evita páginas gigantes
+ARTICLE_TEXT_CHARS = 12000      # texto guardado por artigo (o resumo usa bem menos)
+
+def _cache_path(namespace: str, key: str):
+    cache_dir = os.getenv("NEWS_CACHE_DIR")
+    if not cache_dir:
+        return None
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(os.path.expanduser(cache_dir), namespace, digest + ".json")
+
+def cache_get(namespace: str, key: str, ttl: int):
+    """Valor salvo há menos de `ttl` segundos, ou None (sem cache/expirado)."""
+    path = _cache_path(namespace, key)
+    if not path:
+        return None
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cache_set(namespace: str, key: str, value):
+    path = _cache_path(namespace, key)
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)  # atômico: chamado de várias threads
+    except OSError:
+        pass
 
 # ----------------- Download + resumo -----------------
 
 def download_article_text(url, timeout=25):
+    text = cache_get("articles", url, ARTICLE_CACHE_TTL)
+    if text is None:
+        text = _download_article_text(url, timeout=timeout)
+        if text:  # falhas não são cacheadas
+            cache_set("articles", url, text)
+    return text
+
+def _download_article_text(url, timeout=25):
     try:
-        r = requests.get(url, timeout=timeout, headers=USER_AGENT)
-        if r.status_code != 200:
-            return ""
-        soup = BeautifulSoup(r.text, "lxml")
-        paras = [p.get_text(" ", strip=True) for p in soup.select("article p")]
-        if not paras:
-            paras = [p.get_text(" ", strip=True) for p in soup.select("p")]
-        text = " ".join(paras)
-        return text[:12000]
+        with SESSION.get(url, timeout=timeout, stream=True) as r:
+            if r.status_code != 200:
+                return ""
+            return stream_article_text(r)
     except Exception:
         return ""
 
-def summarize_text(text, max_chars=900):
+def stream_article_text(r, max_chars=ARTICLE_TEXT_CHARS):
+    """
+    Texto dos <p> do artigo, parseando o HTML à medida que chega. Prefere
+    os <p> dentro de <article> (senão, todos os <p>) e para de baixar assim
+    que o texto do artigo passa de max_chars.
+    """
+    chunks = r.iter_content(64 * 1024)
+    # chunks HTTP/gzip podem ser bem menores que 4 KB: junta o início do corpo
+    # antes de escolher o encoding (o <meta charset> precisa estar nele)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 4096:
+            break
+    if not head:
+        return ""
+    parser = etree.HTMLPullParser(events=("end",), tag="p",
+                                  encoding=sniff_encoding(r, head), collect_ids=False)
+    article, other = [], []
+    article_len = other_len = total = 0
+    for chunk in chain([head], chunks, [None]):
+        if chunk is None:
+            parser.close()  # fim do corpo: libera os eventos pendentes
+        else:
+            parser.feed(chunk)
+            total += len(chunk)
+        for _, p in parser.read_events():
+            text = node_text(p)
+            if not text:
+                continue
+            if next(p.iterancestors("article"), None) is not None:
+                article.append(text)
+                article_len += len(text) + 1
+            elif other_len < max_chars:  # só usado se não houver <article>
+                other.append(text)
+                other_len += len(text) + 1
+        if article_len >= max_chars or total >= MAX_ARTICLE_BYTES:
+            break
+    return " ".join(article or other)[:max_chars]
+
+# uma frase: do primeiro caractere não-branco até . ! ? seguido de espaço (ou o fim)
+SENTENCE_RE = re.compile(r"\S.*?(?:(?<=[.!?])(?=\s)|\Z)", re.S)
+
+def _first_sentences(text, limit, max_sentences):
+    # frases longas o bastante dentro de text[:limit], paradas em max_sentences
+    parts = []
+    for m in SENTENCE_RE.finditer(text, 0, limit):
+        sentence = m.group().strip()
+        if m.end() >= limit and len(text) > limit and sentence[-1] not in ".!?":
+            break  # frase cortada pelo limite
+        if len(sentence) > 40:
+            parts.append(sentence)
+            if len(parts) >= max_sentences:
+                break
+    return parts
+
+def summarize_text(text, max_chars=900, max_sentences=6):
     if not text:
         return ""
-    parts = [p.strip() for p in text.split(". ") if len(p.strip()) > 40]
-    summary = ". ".join(parts[:6])
+    # varre as frases sob demanda e para nas primeiras longas o bastante;
+    # normalmente nada além de 3× o tamanho do resumo chega a ser examinado
+    limit = max_chars * 3
+    parts = _first_sentences(text, limit, max_sentences)
+    if not parts and len(text) > limit:
+        # janela sem frase aproveitável (sem pontuação, ou frases longas só
+        # depois dela): varre o texto todo
+        parts = _first_sentences(text, len(text), max_sentences)
+    summary = " ".join(parts)
     if len(summary) > max_chars:
         summary = summary[:max_chars].rsplit(" ", 1)[0] + "…"
     return summary
 
+def fetch_article_summary(url):
+    # download + resumo no mesmo worker: o resumo de um artigo roda enquanto
+    # os outros ainda esperam a rede, e o texto completo não sai da thread.
+    # Sem memo: o Deduper já garante que cada URL chega aqui uma vez só.
+    return summarize_text(download_article_text(url))
+
 # ----------------- Explicador para Economia -----------------
 
+# cada grupo de palavras-chave vira uma alternância compilada uma vez
+ECON_HINTS = [(re.compile("|".join(map(re.escape, kws))), hint) for kws, hint in [
+    (["selic","juros","taxa de juros","copom"],
+     "Juros altos encarecem crédito e tendem a desacelerar consumo e investimento."),
+    (["inflacao","ipca","precos"],
+     "Inflação alta corrói renda real e reduz poder de compra das famílias."),
+    (["pib","atividade","crescimento"],
+     "PIB fraco indica demanda desaquecida; setores cíclicos sentem primeiro."),
+    (["fiscal","arcabouco","deficit","divida","primario"],
+     "Risco fiscal pressiona juros longos e pode impor cortes de gasto/alta de impostos."),
+    (["emprego","desemprego","mercado de trabalho"],
+     "Mercado de trabalho fraco costuma atrasar recuperação do consumo."),
+    (["credito","inadimplencia","calote"],
+     "Crédito restrito e inadimplência alta restringem vendas e investimento."),
+]]
+
 def economic_explainer(text_or_title: str) -> str:
     t = normalize_kw(text_or_title)
     hints = []
-    if any(k in t for k in ["selic","juros","taxa de juros","copom"]):
-        hints.append("Juros altos encarecem crédito e tendem a desacelerar consumo e investimento.")
-    if any(k in t for k in ["inflacao","ipca","precos"]):
-        hints.append("Inflação alta corrói renda real e reduz poder de compra das famílias.")
-    if any(k in t for k in ["pib","atividade","crescimento"]):
-        hints.append("PIB fraco indica demanda desaquecida; setores cíclicos sentem primeiro.")
-    if any(k in t for k in ["fiscal","arcabouco","deficit","divida","primario"]):
-        hints.append("Risco fiscal pressiona juros longos e pode impor cortes de gasto/alta de impostos.")
-    if any(k in t for k in ["emprego","desemprego","mercado de trabalho"]):
-        hints.append("Mercado de trabalho fraco costuma atrasar recuperação do consumo.")
-    if any(k in t for k in ["credito","inadimplencia","calote"]):
-        hints.append("Crédito restrito e inadimplência alta restringem vendas e investimento.")
+    for pattern, hint in ECON_HINTS:
+        if pattern.search(t):
+            hints.append(hint)
+            if len(hints) == 2:
+                break
     if not hints:
         hints.append("Acompanhe impactos sobre juros, inflação, emprego e contas públicas para contexto.")
-    return " ".join(hints[:2])
+    return " ".join(hints)
 
 # ----------------- NYT via RSS com description/content -----------------
 
 def fetch_nyt_rss(feed_url, max_items=WANT_PER_SECTION*2):
     out = []
     try:
-        r = requests.get(feed_url, timeout=20, headers=USER_AGENT)
-        if r.status_code != 200:
-            return out
-        soup = BeautifulSoup(r.text, "xml")
-        for item in soup.select("item")[:max_items]:
-            title = item.title.get_text(strip=True) if item.title else ""
-            link = item.link.get_text(strip=True) if item.link else ""
-            desc = ""
-            if item.find("description"):
-                desc = BeautifulSoup(item.description.get_text(), "lxml").get_text(" ", strip=True)
-            content_tag = item.find("content:encoded")
-            if not desc and content_tag:
-                desc = BeautifulSoup(content_tag.get_text(), "lxml").get_text(" ", strip=True)
-            if not desc and link:
-                desc = summarize_text(download_article_text(link))
-            if title and link:
-                out.append((title, link, summarize_text(desc)))
+        with SESSION.get(feed_url, timeout=20, stream=True) as r:
+            if r.status_code != 200:
+                return out
+            r.raw.decode_content = True  # gzip/br descomprimidos no stream
+            # parse incremental: para de ler o feed depois de max_items itens
+            items = etree.iterparse(r.raw, events=("end",), tag="item", **RSS_PARSE_OPTS)
+            for _, item in islice(items, max_items):
+                title = (item.findtext("title") or "").strip()
+                link = (item.findtext("link") or "").strip()
+                desc = html_to_text(item.findtext("description"))
+                if not desc:
+                    desc = html_to_text(item.findtext(RSS_CONTENT_ENCODED))
+                item.clear()
+                # sem description: resumo None e o artigo só é baixado em
+                # rotina(), depois da deduplicação
+                if title and link:
+                    out.append((title, link, summarize_text(desc) if desc else None))
         return out
     except Exception:
         return out
 
+def fetch_feeds(feed_urls, max_items=WANT_PER_SECTION*2):
+    # feeds são independentes: baixa todos ao mesmo tempo
+    feeds = {}
+    for url in feed_urls:
+        cached = cache_get("feeds", url, LISTING_CACHE_TTL)
+        if cached:
+            feeds[url] = [tuple(x) for x in cached]
+    pending = [u for u in feed_urls if u not in feeds]
+    with ThreadPoolExecutor(max_workers=LISTING_WORKERS) as ex:
+        results = list(ex.map(lambda u: fetch_nyt_rss(u, max_items=max_items), pending))
+    for url, items in zip(pending, results):
+        if items:
+            cache_set("feeds", url, items)
+        feeds[url] = items
+    return feeds
+
 # ----------------- Montagem da newsletter (padrão acordado) -----------------
 
+# templates por item; título/link/resumo entram escapados (texto vem dos sites)
+ITEM_HTML = "<li>\n<p><strong><a href='{link}'>{title}</a></strong><br>{summary}</p>\n</li>"
+ECON_ITEM_HTML = (
+    "<li>\n<p><strong><a href='{link}'>{title}</a></strong><br>{summary}</p>\n"
+    "<p><em>Como ler:</em> {explainer}</p>\n</li>"
+)
+HEALTH_ITEM_HTML = "<li><p><strong><a href='{link}'>{title}</a></strong><br>{summary}</p></li>"
+
+def render_item(title, link, summary, is_econ):
+    fields = {"title": escape(title), "link": escape(link), "summary": escape(summary)}
+    if is_econ:
+        fields["explainer"] = economic_explainer(title + " " + summary)
+        return ECON_ITEM_HTML.format_map(fields)
+    return ITEM_HTML.format_map(fields)
+
+# ordem dos jornais na newsletter e o cabeçalho de cada um
+SOURCE_HEADINGS = {
+    "Estadão": "<h3>Política e Economia – O Estado de S. Paulo</h3>",
+    "Valor": "<h3>Economia & Finanças – Valor Econômico</h3>",
+    "O Globo": "<h3>Primeiro Caderno – O Globo</h3>",
+    "NYT": "<h3>The New York Times – Geral / Business / Finance / Opinion</h3>",
+}
+
 def build_html(news_per_source, health_items):
     html = []
     html.append("<html><body style='font-family:Arial,Helvetica,sans-serif'>")
     html.append("<h2>Resumo diário – 07:00</h2>")
 
-    ordem = ["Estadão", "Valor", "O Globo", "NYT"]
-    for jornal in ordem:
+    for jornal, heading in SOURCE_HEADINGS.items():
         blocks = news_per_source.get(jornal, [])
         if not blocks:
             continue
-        if jornal == "Estadão":
-            html.append("<h3>Política e Economia – O Estado de S. Paulo</h3>")
-        elif jornal == "Valor":
-            html.append("<h3>Economia & Finanças – Valor Econômico</h3>")
-        elif jornal == "O Globo":
-            html.append("<h3>Primeiro Caderno – O Globo</h3>")
-        elif jornal == "NYT":
-            html.append("<h3>The New York Times – Geral / Business / Finance / Opinion</h3>")
+        html.append(heading)
 
         for section_name, items in blocks:
             if not items:
                 continue
             html.append(f"<h4>{section_name}</h4>")
             html.append("<ul>")
-            for title, link, summary, is_econ in items:
-                html.append("<li>")
-                html.append(f"<p><strong><a href='{link}'>{title}</a></strong><br>{summary}</p>")
-                if is_econ:
-                    html.append(f"<p><em>Como ler:</em> {economic_explainer(title + ' ' + summary)}</p>")
-                html.append("</li>")
+            html.extend(render_item(*item) for item in items)
             html.append("</ul>")
 
     if health_items:
         html.append("<hr>")
         html.append("<h3>Especial: Saúde / Planos / Seguros</h3>")
         html.append("<ul>")
-        for title, link, summary in health_items:
-            html.append(f"<li><p><strong><a href='{link}'>{title}</a></strong><br>{summary}</p></li>")
+        html.extend(
+            HEALTH_ITEM_HTML.format(title=escape(title), link=escape(link), summary=escape(summary))
+            for title, link, summary in health_items
+        )
         html.append("</ul>")
 
     html.append("</body></html>")
@@ -362,21 +690,28 @@ def build_html(news_per_source, health_items):
 
 # ----------------- E-mail (tolerante a env vazios + debug + retries) -----------------
 
+class SMTPUnreachable(Exception):
+    """Falha ao abrir a conexão SMTP (antes de login/envio)."""
+
 def enviar_email(conteudo_html):
     """
     Envia o HTML por SMTP usando credenciais do ambiente (secrets).
     - Tenta primeiro SSL (porta 465), depois STARTTLS (porta 587)
-    - Faz até 3 tentativas com pequeno backoff
+    - Faz até 3 tentativas com pequeno backoff; porta que nem conecta
+      não é tentada de novo
     - Loga detalhes úteis no CI (sem expor segredos)
     - Usa defaults seguros se secrets opcionais vierem vazios/invalidos
+    - DEST_EMAIL aceita vários endereços separados por vírgula: uma única
+      mensagem para todos (o servidor só a recusa se recusar todos)
     Secrets opcionais:
         EMAIL_SMTP_HOST, EMAIL_SMTP_SSL_PORT, EMAIL_SMTP_TLS_PORT
     """
     remetente = os.getenv("EMAIL_USER")
     senha = os.getenv("EMAIL_PASS")
-    destinatario = os.getenv("DEST_EMAIL")
-    if not (remetente and senha and destinatario):
+    destinatarios = [d.strip() for d in (os.getenv("DEST_EMAIL") or "").split(",") if d.strip()]
+    if not (remetente and senha and destinatarios):
         raise RuntimeError("EMAIL_USER/EMAIL_PASS/DEST_EMAIL não configurados.")
+    destinatario = ", ".join(destinatarios)
 
     def _env_int(name: str, default: int) -> int:
         val = os.getenv(name)
@@ -398,158 +733,149 @@ def enviar_email(conteudo_html):
     msg["Reply-To"] = remetente
     msg.attach(MIMEText(conteudo_html, "html", "utf-8"))
 
+    def _send_all(srv):
+        # um envio só: o corpo HTML trafega uma vez para todos os endereços
+        recusados = srv.send_message(msg, to_addrs=destinatarios)
+        if recusados:
+            print(f"[mail] Destinatários recusados: {', '.join(recusados)}")
+
+    def _connect(smtp_cls, port):
+        # só a conexão (TCP + handshake TLS do SMTP_SSL + saudação) é marcada;
+        # falhas depois dela (login, envio) não condenam o transporte
+        try:
+            return smtp_cls(host, port, timeout=30)
+        except OSError as e:
+            raise SMTPUnreachable(f"{host}:{port} inacessível: {e!r}") from e
+
     def _try_ssl():
-        import smtplib
-        with smtplib.SMTP_SSL(host, ssl_port, timeout=30) as srv:
+        with _connect(smtplib.SMTP_SSL, ssl_port) as srv:
             srv.set_debuglevel(1)  # imprime conversa SMTP no log do Actions
             srv.login(remetente, senha)
-            return srv.send_message(msg)
+            _send_all(srv)
 
     def _try_tls():
-        import smtplib
-        with smtplib.SMTP(host, tls_port, timeout=30) as srv:
+        with _connect(smtplib.SMTP, tls_port) as srv:
             srv.set_debuglevel(1)
             srv.ehlo()
             srv.starttls()
             srv.ehlo()
             srv.login(remetente, senha)
-            return srv.send_message(msg)
+            _send_all(srv)
 
+    transportes = [("SSL", ssl_port, _try_ssl), ("STARTTLS", tls_port, _try_tls)]
     last_err = None
     for attempt in range(1, 3 + 1):
-        try:
-            print(f"[mail] Tentativa {attempt}/3 via SSL {host}:{ssl_port} -> To={destinatario}")
-            _try_ssl()
-            print("[mail] Enviado com SSL.")
-            return
-        except Exception as e_ssl:
-            print(f"[mail] Falha SSL: {e_ssl!r}")
-            last_err = e_ssl
+        for transporte in list(transportes):
+            nome, port, enviar = transporte
             try:
-                print(f"[mail] Tentativa {attempt}/3 via STARTTLS {host}:{tls_port} -> To={destinatario}")
-                _try_tls()
-                print("[mail] Enviado com STARTTLS.")
+                print(f"[mail] Tentativa {attempt}/3 via {nome} {host}:{port} -> To={destinatario}")
+                enviar()
+                print(f"[mail] Enviado com {nome}.")
                 return
-            except Exception as e_tls:
-                print(f"[mail] Falha STARTTLS: {e_tls!r}")
-                last_err = e_tls
-                import time
-                time.sleep(2 * attempt)
+            except Exception as e:
+                print(f"[mail] Falha {nome}: {e!r}")
+                last_err = e
+                # porta que nem conectou: não gasta outro handshake nela; erros
+                # depois de conectar (login, timeout no envio) seguem tentando
+                if len(transportes) > 1 and isinstance(e, SMTPUnreachable):
+                    transportes.remove(transporte)
+        if attempt < 3:
+            time.sleep(2 * attempt)
 
     raise RuntimeError(f"Falha ao enviar e-mail após 3 tentativas: {last_err!r}")
 
 # ----------------- Coleta por seção com filtro de editoria + dedup -----------------
 
-def fetch_links_bulk(driver, url, scan_limit=SCAN_LIMIT):
-    links = fetch_links_via_requests(url, scan_limit=scan_limit)
-    if links:
-        return links
-    return fetch_links_via_selenium(driver, url, scan_limit=scan_limit)
-
 def belongs_to_section(url: str, must_parts: list[str]) -> bool:
     path = urlsplit(url).path.lower()
     return any(part in path for part in must_parts)
 
-def collect_section_items(driver, url, must_parts, global_deduper, want_items=WANT_PER_SECTION):
-    raw_links = fetch_links_bulk(driver, url, scan_limit=SCAN_LIMIT)
-    section_items = []
+def select_section_links(raw_links, must_parts, global_deduper, want_items=WANT_PER_SECTION):
+    candidates = []
     for title, link in raw_links:
         if not belongs_to_section(link, must_parts):
             continue
         if global_deduper.is_dup(title, link):
             continue
-        text = download_article_text(link)
-        summary = summarize_text(text)
-        section_items.append((title, link, summary))
-        if len(section_items) >= want_items:
+        candidates.append((title, link))
+        if len(candidates) >= want_items:
             break
-    return section_items
+    return candidates
 
 # ----------------- Rotina principal -----------------
 
-def fetch_nyt_rss(feed_url, max_items=WANT_PER_SECTION*2):
-    out = []
-    try:
-        r = requests.get(feed_url, timeout=20, headers=USER_AGENT)
-        if r.status_code != 200:
-            return out
-        soup = BeautifulSoup(r.text, "xml")
-        for item in soup.select("item")[:max_items]:
-            title = item.title.get_text(strip=True) if item.title else ""
-            link = item.link.get_text(strip=True) if item.link else ""
-            desc = ""
-            if item.find("description"):
-                desc = BeautifulSoup(item.description.get_text(), "lxml").get_text(" ", strip=True)
-            content_tag = item.find("content:encoded")
-            if not desc and content_tag:
-                desc = BeautifulSoup(content_tag.get_text(), "lxml").get_text(" ", strip=True)
-            if not desc and link:
-                desc = summarize_text(download_article_text(link))
-            if title and link:
-                out.append((title, link, summarize_text(desc)))
-        return out
-    except Exception:
-        return out
-
 def rotina():
     if not should_send_now():
         print("Agora não é 07:00 America/Sao_Paulo (use FORCE_SEND_ANYTIME=1 para forçar).")
         return
 
-    driver = get_driver()
+    driver = LazyDriver()
     try:
         news_per_source = {}
         health_bucket = []
         deduper = Deduper()
 
-        for jornal, sections in SECTIONS.items():
-            collected = []
-
-            # NYT via RSS (resumos mais consistentes)
-            if jornal == "NYT":
+        # listagens de todas as editorias HTML e feeds RSS de uma vez (I/O em
+        # paralelo); a deduplicação abaixo continua na ordem de SECTIONS
+        confs = [conf for sections in SECTIONS.values() for conf in sections.values()]
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            feeds_future = ex.submit(fetch_feeds, [c["rss"] for c in confs if "rss" in c])
+            listings = fetch_listings(driver, [c["url"] for c in confs if "url" in c])
+            feeds = feeds_future.result()
+
+        # downloads de artigos começam assim que cada editoria é selecionada e
+        # correm em paralelo com a seleção das seguintes (um pool para a rodada)
+        with ThreadPoolExecutor(max_workers=ARTICLE_WORKERS) as articles:
+            for jornal, sections in SECTIONS.items():
+                collected = []
+
+                # NYT via RSS (resumos mais consistentes)
+                if jornal == "NYT":
+                    for section_name, conf in sections.items():
+                        rss = conf.get("rss")
+                        if not rss:
+                            continue
+                        items = []
+                        for (title, link, summary) in feeds[rss]:
+                            if deduper.is_dup(title, link):
+                                continue
+                            is_econ = section_name.lower() in {"finance", "business"}
+                            if summary is None:
+                                summary = articles.submit(fetch_article_summary, link)
+                            items.append((title, link, summary, is_econ))
+                            if len(items) >= WANT_PER_SECTION:
+                                break
+                        collected.append((section_name, items))
+                    news_per_source[jornal] = collected
+                    continue
+
+                # Demais jornais (HTML com filtro por editoria)
                 for section_name, conf in sections.items():
-                    rss = conf.get("rss")
-                    if not rss:
-                        continue
+                    url = conf["url"]
+                    must_parts = conf["path_must_include"]
                     items = []
-                    for (title, link, summary) in fetch_nyt_rss(rss, max_items=WANT_PER_SECTION * 2):
-                        if deduper.is_dup(title, link):
-                            continue
-                        is_econ = section_name.lower() in {"finance", "business"}
-                        items.append((title, link, summary, is_econ))
-                        # bucket de saúde
-                        t_norm = normalize_kw(title)
-                        if any(normalize_kw(k) in t_norm for k in HEALTH_KEYWORDS):
-                            health_bucket.append((title, link, summary))
-                        if len(items) >= WANT_PER_SECTION:
-                            break
+                    for (title, link) in select_section_links(
+                            listings[url], must_parts, deduper, want_items=WANT_PER_SECTION):
+                        is_econ = (section_name.lower() in {"economia", "finanças", "empresas"})
+                        items.append((title, link, articles.submit(fetch_article_summary, link), is_econ))
                     collected.append((section_name, items))
                 news_per_source[jornal] = collected
-                continue
-
-            # Demais jornais (HTML com filtro por editoria)
-            for section_name, conf in sections.items():
-                url = conf["url"]
-                must_parts = conf["path_must_include"]
-                items = []
-                for (title, link, summary) in collect_section_items(
-                        driver, url, must_parts, deduper, want_items=WANT_PER_SECTION):
-                    is_econ = (section_name.lower() in {"economia", "finanças", "empresas"})
-                    items.append((title, link, summary, is_econ))
-
-                    # bucket de saúde
-                    t_norm = normalize_kw(title)
-                    if any(normalize_kw(k) in t_norm for k in HEALTH_KEYWORDS):
-                        health_bucket.append((title, link, summary))
 
-                collected.append((section_name, items))
-            news_per_source[jornal] = collected
+        # resumos pendentes + bucket de saúde, na ordem de SECTIONS
+        for blocks in news_per_source.values():
+            for i, (section_name, items) in enumerate(blocks):
+                items = [(title, link, summary.result() if isinstance(summary, Future) else summary, is_econ)
+                         for title, link, summary, is_econ in items]
+                blocks[i] = (section_name, items)
+                health_bucket.extend((title, link, summary) for title, link, summary, _ in items
+                                     if is_health_title(title))
 
         html = build_html(news_per_source, health_bucket)
         enviar_email(html)
 
     finally:
         driver.quit()
+        SESSION.close()  # fecha as conexões keep-alive do pool
 
 # ----------------- Main -----------------
 